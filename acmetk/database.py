@@ -6,7 +6,14 @@ from aiohttp import web
 from sqlalchemy import select, event
 from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from sqlalchemy.orm import sessionmaker, selectinload, aliased
+from sqlalchemy.orm import (
+    sessionmaker,
+    selectinload,
+    aliased,
+    noload,
+    raiseload,
+    defer,
+)
 
 from acmetk import models
 from acmetk.models import (
@@ -99,15 +106,27 @@ def versioned_session(session):
 
 
 class Database:
-    ALEMBIC_REVISION = "24004ca7a5ea"
-
-    def __init__(self, connection_string, pool_size=5, **kwargs):
+    ALEMBIC_REVISION = "c41d9a7e0b53"
+
+    POOL_SIZE = 20
+    """Default number of connections that the engine's pool keeps open."""
+
+    def __init__(
+        self,
+        connection_string,
+        pool_size=POOL_SIZE,
+        max_overflow=10,
+        pool_recycle=1800,
+        **kwargs,
+    ):
         # asyncpg typeinfo_tree slows down for custom types - including enums when using the pg jit
         # https://github.com/MagicStack/asyncpg/issues/530
         # -> disable the jit via connect_args/server_settings
         self.engine = create_async_engine(
             connection_string,
             pool_size=pool_size,
+            max_overflow=max_overflow,
+            pool_recycle=pool_recycle,
             connect_args={"server_settings": {"jit": "off"}},
             # echo=True,
             native_inet_types=True,
@@ -140,18 +159,12 @@ class Database:
 
     @staticmethod
     async def get_account(session, key=None, kid=None, account_id=None):
-        statement = (
-            select(Account)
-            .options(
-                selectinload(Account.orders)
-                .selectinload(Order.identifiers)
-                .selectinload(Identifier.authorization)
-            )
-            .filter(
-                (Account.key == key)
-                | (Account.kid == kid)
-                | (Account.account_id == account_id)
-            )
+        # The account is looked up on every verified request, but none of the handlers walk its orders.
+        # They are queried separately where needed, see get_orders_list.
+        statement = select(Account).filter(
+            (Account.key == key)
+            | (Account.kid == kid)
+            | (Account.account_id == account_id)
         )
 
         result = (await session.execute(statement)).first()
@@ -167,6 +180,8 @@ class Database:
 
         statement = (
             select(Order)
+            # the orders list only links to the orders, the CSR is never read
+            .options(defer(Order.csr))
             .filter(Order.account_id == account_id)
             .offset(cursor * limit)
             .limit(
@@ -191,6 +206,10 @@ class Database:
                 .selectinload(identifier.order)
                 .selectinload(Order.account),
                 selectinload(authorization.challenges),
+                # changes are only ever appended to by the versioned session
+                noload(authorization.changes),
+                # everything the authz handler touches is loaded above, fail loudly otherwise
+                raiseload("*"),
             )
             .join(identifier, authorization.identifier_id == identifier.identifier_id)
             .join(order, identifier.order_id == order.order_id)
@@ -140,6 +140,14 @@ def run(config_file, bootstrap_port, path):
     """
     config = load_config(config_file)
 
+    # uvloop is not a dependency, but use it as a faster drop-in event loop if it is installed.
+    try:
+        import uvloop
+    except ImportError:
+        pass
+    else:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+
     loop = asyncio.get_event_loop()
 
     app_config_name = list(config.keys())[0]
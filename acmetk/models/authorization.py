@@ -90,7 +90,7 @@ class Authorization(Entity, Serializer):
             self.status = AuthorizationStatus.EXPIRED
             return self.status
 
-        if self.status != AuthorizationStatus.PENDING:
+        if self.status is not AuthorizationStatus.PENDING:
             return self.status
 
         statuses = {challenge.status for challenge in self.challenges}
@@ -113,7 +113,7 @@ class Authorization(Entity, Serializer):
         :param expired: Reports an otherwise valid but expired authorization as valid if set to *True*.
         :return: *True* iff the authorization is valid.
         """
-        return self.status == AuthorizationStatus.VALID and (
+        return self.status is AuthorizationStatus.VALID and (
             not self.is_expired() or expired
         )
 
@@ -132,8 +132,8 @@ class Authorization(Entity, Serializer):
 
         # the only allowed state transition is VALID -> DEACTIVATED if requested by the client
         if (
-            self.status == AuthorizationStatus.VALID
-            and upd.status == AuthorizationStatus.DEACTIVATED
+            self.status is AuthorizationStatus.VALID
+            and upd.status is AuthorizationStatus.DEACTIVATED
         ):
             self.status = AuthorizationStatus.DEACTIVATED
         elif upd.status:
@@ -145,15 +145,15 @@ class Authorization(Entity, Serializer):
         # Section on which challenges to include:
         # https://tools.ietf.org/html/rfc8555#section-7.1.4
         def show_chall(challenge) -> bool:
-            if self.status == AuthorizationStatus.PENDING:
-                return challenge.status in [
+            if self.status is AuthorizationStatus.PENDING:
+                return challenge.status in (
                     ChallengeStatus.PENDING,
                     ChallengeStatus.PROCESSING,
-                ]
-            elif self.status == AuthorizationStatus.VALID:
-                return challenge.status == ChallengeStatus.VALID
-            elif self.status == AuthorizationStatus.INVALID:
-                return challenge.status == ChallengeStatus.INVALID
+                )
+            elif self.status is AuthorizationStatus.VALID:
+                return challenge.status is ChallengeStatus.VALID
+            elif self.status is AuthorizationStatus.INVALID:
+                return challenge.status is ChallengeStatus.INVALID
             else:
                 return False
 
@@ -1,4 +1,5 @@
 import datetime
+import operator
 
 import acme.messages
 import asyncpg
@@ -88,12 +89,26 @@ class Serializer(object):
     __serialize__ = []
     __type_serializers__ = dict()
 
+    @classmethod
+    def _serialize_getters(cls):
+        # resolved once per class instead of walking the mapper's attributes on every call
+        try:
+            return cls.__dict__["_serialize_getters_"]
+        except KeyError:
+            getters = tuple(
+                (c, operator.attrgetter(c))
+                for c in inspect(cls).attrs.keys()
+                if c in cls.__serialize__
+            )
+            cls._serialize_getters_ = getters
+            return getters
+
     def serialize(self, request=None):
-        return {
-            c: self._serialize_value(getattr(self, c))
-            for c in inspect(self).attrs.keys()
-            if c in self.__serialize__ and getattr(self, c) is not None
-        }
+        d = {}
+        for c, getter in self._serialize_getters():
+            if (value := getter(self)) is not None:
+                d[c] = self._serialize_value(value)
+        return d
 
     def _serialize_value(self, value):
         if (type_ := type(value)) in self.__type_serializers__:
@@ -3,7 +3,7 @@ import enum
 import typing
 import uuid
 
-from sqlalchemy import Column, Enum, DateTime, ForeignKey, Integer
+from sqlalchemy import Column, Enum, DateTime, ForeignKey, Integer, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 
@@ -49,6 +49,9 @@ class Challenge(Entity, Serializer):
     __mapper_args__ = {
         "polymorphic_identity": "challenge",
     }
+    __table_args__ = (
+        Index("ix_challenges_authorization_id_status", "authorization_id", "status"),
+    )
 
     _entity = Column(Integer, ForeignKey("entities.entity"), nullable=False, index=True)
     challenge_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
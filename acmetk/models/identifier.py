@@ -20,6 +20,10 @@ class IdentifierType(str, enum.Enum):
     """The ACME *DNS* identifier type."""
 
 
+_IDENTIFIER_TYPES = {type_.value: type_ for type_ in IdentifierType}
+"""Maps the identifier type names used in ACME messages to :class:`IdentifierType` members."""
+
+
 class Identifier(Entity, Serializer):
     """Database model for ACME identifier objects.
 
@@ -61,7 +65,7 @@ class Identifier(Entity, Serializer):
         :param obj: The identifier message object.
         :return: The constructed identifier.
         """
-        return cls(type=IdentifierType(obj.typ.name), value=obj.value)
+        return cls(type=_IDENTIFIER_TYPES[obj.typ.name], value=obj.value)
 
     @property
     def account_of(self):
@@ -1,11 +1,12 @@
 import abc
 import asyncio
-import contextlib
+import collections
 import ipaddress
 import itertools
 import logging
 import random
 import string
+import time
 import typing
 
 import acme.messages
@@ -68,34 +69,59 @@ class RequestIPDNSChallengeValidator(ChallengeValidator):
     request is being made from by checking for a A/AAAA record.
     """
 
-    SUPPORTED_CHALLENGES = frozenset([ChallengeType.DNS_01, ChallengeType.HTTP_01])
+    SUPPORTED_CHALLENGES = frozenset({ChallengeType.DNS_01, ChallengeType.HTTP_01})
     """The types of challenges that the validator supports."""
 
-    async def _query_record(self, name, type_):
-        resolved_ips = []
-
-        with contextlib.suppress(
-            dns.asyncresolver.NXDOMAIN, dns.asyncresolver.NoAnswer
-        ):
-            resp = await dns.asyncresolver.resolve(name, type_)
-            resolved_ips.extend(
-                [
-                    ipaddress.ip_address(record.address)
-                    for record in resp.rrset.items.keys()
-                ]
-            )
+    CACHE_SIZE = 10000
+    """The maximum number of resolved records that are kept in the validator's cache."""
+
+    MAX_CONCURRENT_QUERIES = 256
+    """The maximum number of DNS queries that the validator has in flight at any time."""
+
+    def __init__(self):
+        self._cache = collections.OrderedDict()
+        self._resolver = dns.asyncresolver.Resolver()
+        self._query_semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_QUERIES)
+
+    async def _query_record(self, name, type_, cache=True):
+        key = (name, type_)
+        if cache and (cached := self._cache.get(key)) is not None:
+            expires, resolved_ips = cached
+            if time.monotonic() < expires:
+                self._cache.move_to_end(key)
+                return resolved_ips
+
+            del self._cache[key]
+
+        try:
+            async with self._query_semaphore:
+                resp = await self._resolver.resolve(name, type_)
+        except (dns.asyncresolver.NXDOMAIN, dns.asyncresolver.NoAnswer):
+            return []
+
+        # dnspython already returns A/AAAA addresses in their canonical string form
+        resolved_ips = [record.address for record in resp.rrset]
+
+        if cache:
+            # Only positive answers are cached. The answer's expiration is the smallest TTL of the whole chain,
+            # including any CNAMEs that lead to the record, and is converted to the monotonic clock.
+            expires = time.monotonic() + (resp.expiration - time.time())
+            self._cache[key] = (expires, resolved_ips)
+            if len(self._cache) > self.CACHE_SIZE:
+                self._cache.popitem(last=False)
 
         return resolved_ips
 
-    async def query_records(self, name: str) -> typing.Set[str]:
+    async def query_records(self, name: str, cache: bool = True) -> typing.Set[str]:
         """Queries DNS A and AAAA records.
 
         :param name: Name of the A/AAAA record to query.
+        :param cache: *False* if the answers are not used again and should bypass the cache.
         :return: Set of IPs that the A/AAAA records resolve to.
         """
-        resolved_ips = [
-            await self._query_record(name, type_) for type_ in ("A", "AAAA")
-        ]
+        resolved_ips = await asyncio.gather(
+            *[self._query_record(name, type_, cache) for type_ in ("A", "AAAA")]
+        )
 
         return set(itertools.chain.from_iterable(resolved_ips))
 
@@ -116,6 +142,16 @@ class RequestIPDNSChallengeValidator(ChallengeValidator):
             identifier,
         )
 
+        # Without a usable host IP the check below cannot succeed, skip the DNS queries.
+        host_ip = request.get("actual_ip") if request is not None else None
+        try:
+            # also raises a ValueError if the host IP is missing
+            actual_ip = str(ipaddress.ip_address(host_ip))
+        except ValueError:
+            raise CouldNotValidateChallenge(
+                detail="The IP address of the requesting host could not be determined."
+            )
+
         """Wildcard validation …
         Resolve some names
         """
@@ -127,14 +163,17 @@ class RequestIPDNSChallengeValidator(ChallengeValidator):
                 for i in range(6)
             ]
             names.extend(rnames)
+            # the random names are single-use probes and would only push useful entries out of the cache
             resolved = await asyncio.gather(
-                *[self.query_records(f"{i}.{identifier}") for i in names]
+                *[
+                    self.query_records(f"{i}.{identifier}", cache=i not in rnames)
+                    for i in names
+                ]
             )
             resolved_ips = set.intersection(*resolved)
         else:
             resolved_ips = await self.query_records(identifier)
 
-        actual_ip = request["actual_ip"]
         if actual_ip not in resolved_ips:
             logger.debug(
                 "Validation of challenge %s failed; %s does not resolve to IP %s. Resolved IPs: %s",
@@ -153,7 +192,7 @@ class RequestIPDNSChallengeValidator(ChallengeValidator):
 class DummyValidator(ChallengeValidator):
     """Does not do any validation and reports every challenge as valid."""
 
-    SUPPORTED_CHALLENGES = frozenset([ChallengeType.DNS_01, ChallengeType.HTTP_01])
+    SUPPORTED_CHALLENGES = frozenset({ChallengeType.DNS_01, ChallengeType.HTTP_01})
     """The types of challenges that the validator supports."""
 
     async def validate_challenge(self, challenge: Challenge, **kwargs):
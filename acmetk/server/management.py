@@ -1,4 +1,7 @@
 import collections
+import datetime
+import ipaddress
+import time
 
 import aiohttp_jinja2
 import cryptography
@@ -24,12 +27,24 @@ from .pagination import paginate
 
 
 class AcmeManagementMixin:
+    STATISTICS_TTL = 60
+    """Number of seconds for which the statistics on the management index page are cached."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._statistics_cache = None
+
     @routes.get("/mgmt", name="mgmt-index")
     @aiohttp_jinja2.template("index.jinja2")
     async def management_index(self, request):
-        import datetime
-
         pms = PerformanceMeasurementSystem(enable=request.query.get("pms", False))
+
+        # Serve the cached statistics unless they have expired or the query is to be measured.
+        if self._statistics_cache and not pms.enable:
+            expires, statistics = self._statistics_cache
+            if time.monotonic() < expires:
+                return {"statistics": statistics, "pms": pms}
+
         async with self._session(request) as session:
             now = datetime.datetime.now()
             start_date = now - datetime.timedelta(days=28)
@@ -82,6 +97,11 @@ class AcmeManagementMixin:
                         sum(map(lambda x: x["unique"], s[i].values())),
                     )
                 )
+
+            self._statistics_cache = (
+                time.monotonic() + self.STATISTICS_TTL,
+                statistics,
+            )
             return {"statistics": statistics, "pms": pms}
 
     @routes.get("/mgmt/changes", name="mgmt-changes")
@@ -119,8 +139,6 @@ class AcmeManagementMixin:
 
                 # remote host ipaddress cidr query
                 try:
-                    import ipaddress
-
                     ipaddress.ip_interface(value)
                     f.append(
                         Change.remote_host.op("<<=")(
@@ -130,13 +148,6 @@ class AcmeManagementMixin:
                 except ValueError:
                     pass
 
-            q = select(sqlalchemy.func.count(Change.change))
-            if f:
-                q = q.filter(sqlalchemy.or_(*f))
-
-            async with pms.measure():
-                total = (await session.execute(q)).scalars().first()
-
             q = select(Change).options(
                 selectin_polymorphic(Change.entity, [Account]),
                 selectinload(Change.entity.of_type(Authorization))
@@ -158,12 +169,7 @@ class AcmeManagementMixin:
             )
             if f:
                 q = q.filter(sqlalchemy.or_(*f))
-            q = q.order_by(Change.change.desc())
-            if f:
-                limit = "limit"
-            else:
-                limit = Change.change
-            page = await paginate(session, request, q, limit, total, pms)
+            page = await paginate(session, request, q, Change.change, pms)
 
             return {"changes": page.items, "page": page, "pms": pms}
 
@@ -172,18 +178,13 @@ class AcmeManagementMixin:
     async def management_accounts(self, request):
         pms = PerformanceMeasurementSystem(enable=request.query.get("pms", False))
         async with self._session(request) as session:
-            q = select(sqlalchemy.func.count(Account.account_id))
-            async with pms.measure():
-                total = (await session.execute(q)).scalars().first()
-
             q = (
                 select(Account)
                 .options(selectinload(Account.orders))
                 .options(selectinload(Account.changes).selectinload(Change.entity))
-                .order_by(Account._entity.desc())
             )
 
-            page = await paginate(session, request, q, "limit", total, pms=pms)
+            page = await paginate(session, request, q, Account._entity, pms=pms)
 
             return {"accounts": page.items, "page": page, "pms": pms}
 
@@ -216,24 +217,16 @@ class AcmeManagementMixin:
     async def management_orders(self, request):
         pms = PerformanceMeasurementSystem(enable=request.query.get("pms", False))
         async with self._session(request) as session:
-            q = select(sqlalchemy.func.count(Order.order_id))
-            async with pms.measure():
-                total = (await session.execute(q)).scalars().first()
-
-            q = (
-                select(Order)
-                .options(
-                    defer("csr"),
-                    selectinload(Order.account).options(defer("key")),
-                    selectinload(Order.identifiers),
-                    selectinload(Order.changes).options(
-                        defer("data"),
-                    ),
-                )
-                .order_by(Order._entity.desc())
+            q = select(Order).options(
+                defer("csr"),
+                selectinload(Order.account).options(defer("key")),
+                selectinload(Order.identifiers),
+                selectinload(Order.changes).options(
+                    defer("data"),
+                ),
             )
 
-            page = await paginate(session, request, q, "limit", total)
+            page = await paginate(session, request, q, Order._entity, pms=pms)
             return {"orders": page.items, "page": page, "pms": pms}
 
     @routes.get("/mgmt/orders/{order}", name="mgmt-order")
@@ -241,27 +234,15 @@ class AcmeManagementMixin:
     async def management_order(self, request):
         order = request.match_info["order"]
         pms = PerformanceMeasurementSystem(enable=request.query.get("pms", False))
-        changes = []
         async with self._session(request) as session:
             q = (
                 select(Order)
                 .options(
                     selectinload(Order.account),
-                    selectinload(Order.identifiers).options(
-                        selectinload(Identifier.authorization).options(
-                            selectinload(Authorization.challenges)
-                            .selectinload(Challenge.changes)
-                            .selectinload(Change.entity),
-                            selectinload(Authorization.changes).selectinload(
-                                Change.entity
-                            ),
-                        ),
-                        selectinload(Identifier.changes).selectinload(Change.entity),
-                    ),
-                    selectinload(Order.changes).selectinload(Change.entity),
-                    selectinload(Order.certificate)
-                    .selectinload(Certificate.changes)
-                    .selectinload(Change.entity),
+                    selectinload(Order.identifiers)
+                    .selectinload(Identifier.authorization)
+                    .selectinload(Authorization.challenges),
+                    selectinload(Order.certificate),
                 )
                 .filter(Order.order_id == order)
             )
@@ -269,20 +250,26 @@ class AcmeManagementMixin:
                 r = await session.execute(q)
             o = r.scalars().first()
 
-            changes.extend(o.changes)
-
-        async with pms.measure():
-
+            # The history covers every entity of the order, fetch all of their changes at once
+            # instead of loading them per entity and merging them here.
+            entities = [o._entity]
             for i in o.identifiers:
-                changes.extend(i.changes)
-                changes.extend(i.authorization.changes)
-                for c in i.authorization.challenges:
-                    changes.extend(c.changes)
+                entities.append(i._entity)
+                entities.append(i.authorization._entity)
+                entities.extend(c._entity for c in i.authorization.challenges)
 
             if o.certificate:
-                changes.extend(o.certificate.changes)
+                entities.append(o.certificate._entity)
 
-            changes = sorted(changes, key=lambda x: x.timestamp, reverse=True)
+            q = (
+                select(Change)
+                .options(selectinload(Change.entity))
+                .filter(Change._entity.in_(entities))
+                .order_by(Change.timestamp.desc())
+            )
+            async with pms.measure():
+                r = await session.execute(q)
+            changes = r.scalars().all()
 
         return {"order": o, "changes": changes, "pms": pms}
 
@@ -291,24 +278,16 @@ class AcmeManagementMixin:
     async def management_certificates(self, request):
         pms = PerformanceMeasurementSystem(enable=request.query.get("pms", False))
         async with self._session(request) as session:
-            q = select(sqlalchemy.func.count(Certificate.certificate_id))
-            async with pms.measure():
-                total = (await session.execute(q)).scalars().first()
-
-            q = (
-                select(Certificate)
-                .options(
-                    defer("cert"),
-                    selectinload(Certificate.changes).options(defer("data")),
-                    selectinload(Certificate.order)
-                    .options(defer("csr"), selectinload(Order.identifiers))
-                    .selectinload(Order.account)
-                    .options(defer("key")),
-                )
-                .order_by(Certificate._entity.desc())
+            q = select(Certificate).options(
+                defer("cert"),
+                selectinload(Certificate.changes).options(defer("data")),
+                selectinload(Certificate.order)
+                .options(defer("csr"), selectinload(Order.identifiers))
+                .selectinload(Order.account)
+                .options(defer("key")),
             )
 
-            page = await paginate(session, request, q, "limit", total, pms=pms)
+            page = await paginate(session, request, q, Certificate._entity, pms=pms)
             return {"certificates": page.items, "page": page, "pms": pms}
 
     @routes.get("/mgmt/certificates/{certificate}", name="mgmt-certificate")
@@ -1,90 +1,95 @@
-# not via pip available, therefore stolen
-# https://github.com/wizeline/sqlalchemy-pagination.git
-
-# The MIT License (MIT)
-#
-# Copyright (c) 2016 Wizeline
-#
-# Permission is hereby granted, free of charge, to any person obtaining a copy
-# of this software and associated documentation files (the "Software"), to deal
-# in the Software without restriction, including without limitation the rights
-# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
-# copies of the Software, and to permit persons to whom the Software is
-# furnished to do so, subject to the following conditions:
-#
-# The above copyright notice and this permission notice shall be included in all
-# copies or substantial portions of the Software.
-#
-# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
-# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
-# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
-# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
-# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
-# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
-# SOFTWARE.
-
-import math
-
 from aiohttp import web
+from multidict import MultiDict
+
+CURSOR_PARAMS = ("before", "after")
 
 
 class Page:
-    def __init__(self, items, page, page_size, total):
+    """A page of items that are ordered by a unique key in descending order.
+
+    Pages are addressed by a cursor instead of an offset: *after* selects the items
+    with a key smaller than the cursor (older items), *before* those with a larger key (newer items).
+    """
+
+    def __init__(self, request, items, key, has_previous, has_next):
         self.items = items
-        self.previous_page = None
-        self.next_page = None
-        self.has_previous = page > 1
-        if self.has_previous:
-            self.previous_page = page - 1
-        previous_items = (page - 1) * page_size
-        self.has_next = previous_items + len(items) < total
-        if self.has_next:
-            self.next_page = page + 1
-        self.total = total
-        self.pages = int(math.ceil(total / float(page_size)))
-        self.current_page = page
-
-
-async def paginate(session, request, query, by="limit", total=-1, pms=None):
-    if total is None:
-        # None is passed at the changes endpoint if there are no changes yet.
-        raise web.HTTPBadRequest(body="No changes have been logged.")
+        self.has_previous = has_previous and bool(items)
+        self.has_next = has_next and bool(items)
 
+        self.previous_query = (
+            self._query(request, "before", key(items[0])) if self.has_previous else None
+        )
+        self.next_query = (
+            self._query(request, "after", key(items[-1])) if self.has_next else None
+        )
+        # A cursor past the last item, e.g. after the rows were deleted, leads to an empty page.
+        # Link back to the first page instead of leaving it without navigation.
+        self.first_query = (
+            self._query(request)
+            if not items and any(p in request.query for p in CURSOR_PARAMS)
+            else None
+        )
+
+    @staticmethod
+    def _query(request, param=None, cursor=None):
+        query = MultiDict(request.query)
+        for p in CURSOR_PARAMS:
+            query.popall(p, None)
+        if param:
+            query[param] = str(cursor)
+        return query
+
+
+def _cursor(request, param):
+    try:
+        return int(request.query[param])
+    except KeyError:
+        return None
+    except ValueError:
+        raise web.HTTPBadRequest(body=f"{param} must be an integer")
+
+
+async def paginate(session, request, query, by, pms=None):
+    """Fetches one page of the query's results using keyset pagination.
+
+    The query must not be ordered already, ordering by *by* is added here.
+    As *by* is indexed, every page costs the same regardless of how far back it is
+    and no count of all rows is needed.
+
+    :param by: The unique, indexed column that the items are ordered and paginated by.
+    """
     page_size = int(request.query.get("pagesize", 25))
     if not (0 < page_size < 100):
         raise web.HTTPBadRequest(body=f"page_size ({page_size}) must be > 0 and < 100")
 
-    page_count = max(math.ceil(total / page_size), 1)
-    # min page_count is 1
+    before = _cursor(request, "before")
+    after = _cursor(request, "after")
 
-    page = int(request.query.get("page", page_count))
-    # min page is 1
+    if before is not None:
+        q = query.filter(by > before).order_by(by.asc())
+    else:
+        q = query.order_by(by.desc())
+        if after is not None:
+            q = q.filter(by < after)
 
-    if not (0 < page <= page_count):
-        raise web.HTTPBadRequest(
-            body=f"page ({page}) must be between > 0 and <= {page_count}"
-        )
+    # one extra row tells whether there is another page in the direction of travel
+    q = q.limit(page_size + 1)
 
-    if by != "limit":
-        # BETWEEN on indexed values is way faster …
-        begin = (page - 1) * page_size
-        end = max(page * page_size - 1, 0)
-        q = query.filter(by.between(begin, end))
+    if pms:
+        async with pms.measure():
+            r = await session.execute(q)
     else:
-        begin = (page_count - page) * page_size
-        q = query.limit(page_size).offset(begin)
+        r = await session.execute(q)
+    items = r.scalars().all()
 
-    try:
-        if pms:
-            async with pms.measure():
-                r = await session.execute(q)
-        else:
-            r = await session.execute(q)
-        items = r.scalars().all()
-        assert len(items) <= page_size
+    more = len(items) > page_size
+    items = items[:page_size]
 
-    except Exception as e:
-        print(e)
-        raise e
+    if before is not None:
+        items.reverse()
+        has_previous, has_next = more, True
+    else:
+        has_previous, has_next = after is not None, more
 
-    return Page(items, page, page_size, total)
+    key = by.key
+    return Page(request, items, lambda item: getattr(item, key), has_previous, has_next)
@@ -1,5 +1,6 @@
 import abc
 import asyncio
+import collections
 import cProfile
 import functools
 import ipaddress
@@ -7,10 +8,11 @@ import json
 import logging
 import pstats
 import re
+import secrets
 import string
+import time
 import types
 import typing
-import uuid
 from email.utils import parseaddr
 
 import acme.jws
@@ -21,6 +23,7 @@ import yarl
 from aiohttp import web
 from aiohttp.helpers import sentinel
 from aiohttp.web_middlewares import middleware
+from multidict import CIMultiDict
 from cryptography import x509
 from cryptography.hazmat.primitives import serialization
 from cryptography.hazmat.primitives.asymmetric import rsa, ec
@@ -47,22 +50,30 @@ async def handle_get(request):
     return web.Response(status=405)
 
 
+@functools.lru_cache(maxsize=4096)
+def _parse_ip(address: str):
+    # servers mostly see the same few clients or reverse proxies, parse each address only once
+    return ipaddress.ip_address(address)
+
+
+def _json_dumps(obj) -> str:
+    # response bodies are read by ACME clients, not humans, so skip the default whitespace
+    return json.dumps(obj, separators=(",", ":"))
+
+
 class AcmeResponse(web.Response):
-    def __init__(self, nonce, directory_url, *args, links=None, **kwargs):
-        super().__init__(*args, **kwargs)
-        if links is None:
-            links = []
-
-        links.append(f'<{directory_url}>; rel="index"')
-        self.headers.extend(("Link", link) for link in links)
-
-        self.headers.update(
-            {
-                "Server": f"acmetk Server {__version__}",
-                "Replay-Nonce": nonce,
-                "Cache-Control": "no-store",
-            }
-        )
+    def __init__(self, nonce, directory_url, *args, links=None, headers=None, **kwargs):
+        # assemble all headers up front so the response is constructed in a single pass
+        headers = CIMultiDict(headers or {})
+        for link in links or ():
+            headers.add("Link", link)
+        headers.add("Link", f'<{directory_url}>; rel="index"')
+
+        headers["Server"] = f"acmetk Server {__version__}"
+        headers["Replay-Nonce"] = nonce
+        headers["Cache-Control"] = "no-store"
+
+        super().__init__(*args, headers=headers, **kwargs)
 
 
 class AcmeServerBase(AcmeEABMixin, AcmeManagementMixin, abc.ABC):
@@ -76,19 +87,35 @@ class AcmeServerBase(AcmeEABMixin, AcmeManagementMixin, abc.ABC):
     ORDERS_LIST_CHUNK_LEN = 10
     """Number of order links to include per request."""
 
-    SUPPORTED_JWS_ALGORITHMS = (
-        josepy.jwa.RS256,
-        josepy.jwa.RS384,
-        josepy.jwa.RS512,
-        josepy.jwa.PS256,
-        josepy.jwa.PS384,
-        josepy.jwa.PS512,
-        josepy.jwa.ES256,
-        josepy.jwa.ES384,
-        josepy.jwa.ES512,
+    MAX_NONCES = 100000
+    """Number of issued but unused nonces to keep. The oldest nonce is discarded once the limit is exceeded."""
+
+    NONCE_TTL = 600
+    """Number of seconds that an issued nonce stays valid. Expired nonces are rejected and discarded."""
+
+    DIRECTORY_CACHE_SIZE = 16
+    """Number of serialized directories to keep, one per origin that the server is reached at."""
+
+    SUPPORTED_JWS_ALGORITHMS = frozenset(
+        {
+            josepy.jwa.RS256,
+            josepy.jwa.RS384,
+            josepy.jwa.RS512,
+            josepy.jwa.PS256,
+            josepy.jwa.PS384,
+            josepy.jwa.PS512,
+            josepy.jwa.ES256,
+            josepy.jwa.ES384,
+            josepy.jwa.ES512,
+        }
     )
     """The JWS signing algorithms that the server supports."""
 
+    # error detail for requests signed with any other algorithm, built once instead of on every rejection
+    _SUPPORTED_JWS_ALGORITHMS_DETAIL = "Supported algorithms: " + ", ".join(
+        sorted(str(alg) for alg in SUPPORTED_JWS_ALGORITHMS)
+    )
+
     SUPPORTED_EAB_JWS_ALGORITHMS = (
         josepy.jwa.HS256,
         josepy.jwa.HS384,
@@ -113,6 +140,9 @@ class AcmeServerBase(AcmeEABMixin, AcmeManagementMixin, abc.ABC):
     better than nothing, but  accepts names ending with -
     """
 
+    VALID_EMAIL_RE = re.compile(r"[^@]+@[^@]+\.[^@]+")
+    """Loose check used to tell email addresses apart from other contact URLs such as phone numbers."""
+
     def __init__(
         self,
         *,
@@ -124,6 +154,9 @@ class AcmeServerBase(AcmeEABMixin, AcmeManagementMixin, abc.ABC):
         use_forwarded_header=False,
         require_eab=False,
         allow_wildcard=False,
+        db_pool=None,
+        max_concurrent_validations=None,
+        max_concurrent_finalizations=None,
         **kwargs,
     ):
         super().__init__()
@@ -139,13 +172,34 @@ class AcmeServerBase(AcmeEABMixin, AcmeManagementMixin, abc.ABC):
             },
         }
         self._tos_url = tos_url
-        self._mail_suffixes = mail_suffixes
-        self._subnets = (
-            [ipaddress.ip_network(subnet) for subnet in subnets] if subnets else None
-        )
+        # str.endswith accepts a tuple of suffixes
+        self._mail_suffixes = tuple(mail_suffixes) if mail_suffixes else None
+        if subnets:
+            # Merge overlapping and adjacent networks and group them by IP version,
+            # so that a host IP is only ever compared against the networks of its own family.
+            networks = [ipaddress.ip_network(subnet) for subnet in subnets]
+            self._subnets = {
+                version: tuple(
+                    ipaddress.collapse_addresses(
+                        network for network in networks if network.version == version
+                    )
+                )
+                for version in (4, 6)
+            }
+        else:
+            self._subnets = None
         self._use_forwarded_header = use_forwarded_header
         self._require_eab = require_eab
         self._allow_wildcard = allow_wildcard
+        # Background validations and order finalizations keep a pooled connection checked out while they run.
+        # By default, bound each to a quarter of the pool so that the request handlers still get connections.
+        pool_size = (db_pool or {}).get("pool_size", Database.POOL_SIZE)
+        self._validation_semaphore = asyncio.Semaphore(
+            max_concurrent_validations or max(pool_size // 4, 1)
+        )
+        self._finalization_semaphore = asyncio.Semaphore(
+            max_concurrent_finalizations or max(pool_size // 4, 1)
+        )
 
         self.app = web.Application(
             middlewares=[
@@ -159,7 +213,8 @@ class AcmeServerBase(AcmeEABMixin, AcmeManagementMixin, abc.ABC):
 
         self._add_routes()
 
-        self._nonces = set()
+        self._nonces = collections.OrderedDict()
+        self._directory_cache = collections.OrderedDict()
 
         self._db: typing.Optional[Database] = None
         self._db_session = None
@@ -206,7 +261,7 @@ class AcmeServerBase(AcmeEABMixin, AcmeManagementMixin, abc.ABC):
         :param config: A dictionary holding the configuration. See :doc:`configuration` for supported options.
         :return: The server instance
         """
-        db = Database(config["db"])
+        db = Database(config["db"], **config.get("db_pool", {}))
 
         instance = cls(
             **config,
@@ -291,7 +346,7 @@ class AcmeServerBase(AcmeEABMixin, AcmeManagementMixin, abc.ABC):
         if data and text:
             raise ValueError("only one of data, text, or body should be specified")
         elif data and (data is not sentinel):
-            text = json.dumps(data)
+            text = _json_dumps(data)
             kwargs.update({"content_type": "application/json"})
         else:
             text = data or text
@@ -305,14 +360,20 @@ class AcmeServerBase(AcmeEABMixin, AcmeManagementMixin, abc.ABC):
         )
 
     def _issue_nonce(self):
-        nonce = uuid.uuid4().hex
-        self._nonces.add(nonce)
+        now = time.monotonic()
+
+        # nonces are inserted in order of expiry as the TTL is constant, so the expired ones are at the front
+        while self._nonces and next(iter(self._nonces.values())) <= now:
+            self._nonces.popitem(last=False)
+
+        nonce = secrets.token_hex(16)
+        self._nonces[nonce] = now + self.NONCE_TTL
+        if len(self._nonces) > self.MAX_NONCES:
+            self._nonces.popitem(last=False)
         return nonce
 
     def _verify_nonce(self, nonce):
-        if nonce in self._nonces:
-            self._nonces.remove(nonce)
-        else:
+        if self._nonces.pop(nonce, 0) <= time.monotonic():
             raise acme.messages.Error.with_code("badNonce", detail=nonce)
 
     async def _verify_request(
@@ -356,7 +417,7 @@ class AcmeServerBase(AcmeEABMixin, AcmeManagementMixin, abc.ABC):
                 * The account corresponding to the kid does not have status \
                     :attr:`acmetk.models.AccountStatus.VALID`
         """
-        data = await request.text()
+        data = await request.read()
         try:
             jws = acme.jws.JWS.json_loads(data)
         except josepy.errors.DeserializationError:
@@ -378,7 +439,7 @@ class AcmeServerBase(AcmeEABMixin, AcmeManagementMixin, abc.ABC):
         if sig.alg not in self.SUPPORTED_JWS_ALGORITHMS:
             raise acme.messages.Error.with_code(
                 "badSignatureAlgorithm",
-                detail=f"Supported algorithms: {', '.join([str(alg) for alg in self.SUPPORTED_JWS_ALGORITHMS])}",
+                detail=self._SUPPORTED_JWS_ALGORITHMS_DETAIL,
             )
 
         nonce = acme.jose.b64.b64encode(sig.nonce).decode()
@@ -448,7 +509,7 @@ class AcmeServerBase(AcmeEABMixin, AcmeManagementMixin, abc.ABC):
             # check whether the message is signed using an account key
             jws, account = await self._verify_request(request, session)
         except acme.messages.Error:
-            data = await request.text()
+            data = await request.read()
 
             try:
                 jws = acme.jws.JWS.json_loads(data)
@@ -465,16 +526,9 @@ class AcmeServerBase(AcmeEABMixin, AcmeManagementMixin, abc.ABC):
 
         cert = revocation.certificate
 
-        certificate = await self._db.get_certificate(session, certificate=cert)
-        if not certificate:
-            raise web.HTTPNotFound
-
-        if account:
-            # Check whether the cert was originally issued for that account
-            if not certificate.account_of.account_id == account.account_id:
-                raise acme.messages.Error.with_code("unauthorized")
-        else:
-            # The request was probably signed with the certificate's key pair
+        if not account:
+            # The request was probably signed with the certificate's key pair.
+            # This only needs the certificate from the request, so check it before querying the database.
             jwk = jws.signature.combined.jwk
             if isinstance(
                 cert_key := cert.public_key(),
@@ -492,19 +546,25 @@ class AcmeServerBase(AcmeEABMixin, AcmeManagementMixin, abc.ABC):
             if not jws.verify(jwk):
                 raise acme.messages.Error.with_code("unauthorized")
 
+        certificate = await self._db.get_certificate(session, certificate=cert)
+        if not certificate:
+            raise web.HTTPNotFound
+
+        # Check whether the cert was originally issued for that account
+        if account and not certificate.account_of.account_id == account.account_id:
+            raise acme.messages.Error.with_code("unauthorized")
+
         return certificate, revocation
 
     def _validate_contact_info(self, reg: acme.messages.Registration):
         for contact_url in reg.contact:
             if address := parseaddr(contact_url)[1]:
                 # parseaddr also returns things like phone numbers as valid email addresses, skip these.
-                if not re.match(r"[^@]+@[^@]+\.[^@]+", address):
+                if not self.VALID_EMAIL_RE.match(address):
                     continue
 
                 # The contact URL contains an email address, validate it.
-                if self._mail_suffixes and not any(
-                    [address.endswith(suffix) for suffix in self._mail_suffixes]
-                ):
+                if self._mail_suffixes and not address.endswith(self._mail_suffixes):
                     raise acme.messages.Error.with_code(
                         "invalidContact",
                         detail=f"The contact email '{address}' is not supported.",
@@ -593,22 +653,34 @@ class AcmeServerBase(AcmeEABMixin, AcmeManagementMixin, abc.ABC):
 
         :return: The directory object.
         """
-        directory = {
-            "newAccount": acmetk.util.url_for(request, "new-account"),
-            "newNonce": acmetk.util.url_for(request, "new-nonce"),
-            "newOrder": acmetk.util.url_for(request, "new-order"),
-            "revokeCert": acmetk.util.url_for(request, "revoke-cert"),
-            "keyChange": acmetk.util.url_for(request, "key-change"),
-            "meta": {},
-        }
+        # The directory only depends on the origin the client used to reach the server.
+        origin = acmetk.util.forwarded_url(request).origin()
+
+        if (serialized := self._directory_cache.get(origin)) is None:
+            directory = {
+                "newAccount": acmetk.util.url_for(request, "new-account"),
+                "newNonce": acmetk.util.url_for(request, "new-nonce"),
+                "newOrder": acmetk.util.url_for(request, "new-order"),
+                "revokeCert": acmetk.util.url_for(request, "revoke-cert"),
+                "keyChange": acmetk.util.url_for(request, "key-change"),
+                "meta": {},
+            }
 
-        if self._tos_url:
-            directory["meta"]["termsOfService"] = self._tos_url
+            if self._tos_url:
+                directory["meta"]["termsOfService"] = self._tos_url
 
-        if self._require_eab is not None:
-            directory["meta"]["externalAccountRequired"] = self._require_eab
+            if self._require_eab is not None:
+                directory["meta"]["externalAccountRequired"] = self._require_eab
+
+            serialized = _json_dumps(directory)
+            self._directory_cache[origin] = serialized
+            if len(self._directory_cache) > self.DIRECTORY_CACHE_SIZE:
+                self._directory_cache.popitem(last=False)
+        else:
+            # evict the least recently used origin first, the Host header is client-controlled
+            self._directory_cache.move_to_end(origin)
 
-        return self._response(request, directory)
+        return self._response(request, text=serialized, content_type="application/json")
 
     @routes.get("/new-nonce", name="new-nonce", allow_head=True)
     async def new_nonce(self, request):
@@ -1040,7 +1112,9 @@ class AcmeServerBase(AcmeEABMixin, AcmeManagementMixin, abc.ABC):
             account_id = order.account.account_id
             await session.commit()
 
-        asyncio.ensure_future(self.handle_order_finalize(request, account_id, order_id))
+        asyncio.ensure_future(
+            self._handle_order_finalize(request, account_id, order_id)
+        )
         return self._response(
             request,
             serialized,
@@ -1062,7 +1136,7 @@ class AcmeServerBase(AcmeEABMixin, AcmeManagementMixin, abc.ABC):
     async def _handle_challenge_validate(self, request, account_id, challenge_id):
         logger.debug("Validating challenge %s", challenge_id)
 
-        async with self._session(request) as session:
+        async with self._validation_semaphore, self._session(request) as session:
             challenge = await self._db.get_challenge(session, account_id, challenge_id)
 
             """We want the reverse proxy application to always be able to issue certificates for itself inside the
@@ -1083,15 +1157,14 @@ class AcmeServerBase(AcmeEABMixin, AcmeManagementMixin, abc.ABC):
         """7.3.5.  Account Key Rollover"""
         async with self._session(request) as session:
             jws, account = await self._verify_request(request, session)
-            payload = jws.payload.decode()
-            inner_jws = acme.jws.JWS.json_loads(payload)
+            inner_jws = acme.jws.JWS.json_loads(jws.payload)
 
             """The inner JWS MUST meet the normal requirements …"""
             sig = inner_jws.signature.combined
             if sig.alg not in self.SUPPORTED_JWS_ALGORITHMS:
                 raise acme.messages.Error.with_code(
                     "badSignatureAlgorithm",
-                    detail=f"Supported algorithms: {', '.join([str(alg) for alg in self.SUPPORTED_JWS_ALGORITHMS])}",
+                    detail=self._SUPPORTED_JWS_ALGORITHMS_DETAIL,
                 )
 
             """, with the following differences:"""
@@ -1170,6 +1243,10 @@ class AcmeServerBase(AcmeEABMixin, AcmeManagementMixin, abc.ABC):
                 },
             )
 
+    async def _handle_order_finalize(self, request, account_id, order_id):
+        async with self._finalization_semaphore:
+            await self.handle_order_finalize(request, account_id, order_id)
+
     @abc.abstractmethod
     async def handle_order_finalize(self, request, account_id: str, order_id: str):
         """Method that handles the actual finalization of an order.
@@ -1214,12 +1291,14 @@ class AcmeServerBase(AcmeEABMixin, AcmeManagementMixin, abc.ABC):
 
         """Read the X-Forwarded-For header if the server is behind a reverse proxy.
         Otherwise, use the host address directly."""
-        host_ip = ipaddress.ip_address(forwarded_for or request.remote)
+        host_ip = _parse_ip(forwarded_for or request.remote)
 
         """Attach the actual host IP to the request for re-use in the handler."""
         request["actual_ip"] = host_ip
 
-        if self._subnets and not any([host_ip in subnet for subnet in self._subnets]):
+        if self._subnets and not any(
+            host_ip in subnet for subnet in self._subnets[host_ip.version]
+        ):
             return web.Response(
                 status=403,
                 text=f"{type(self).__name__}: This service is only available from within certain networks."
@@ -1286,13 +1365,15 @@ class AcmeCA(AcmeServerBase):
 
         with open(cert, "rb") as pem:
             self._cert = x509.load_pem_x509_certificate(pem.read())
+        # appended to every issued certificate on retrieval
+        self._cert_pem = self._cert.public_bytes(serialization.Encoding.PEM)
 
         with open(private_key, "rb") as pem:
             self._private_key = serialization.load_pem_private_key(pem.read(), None)
 
     @classmethod
     async def create_app(cls, config, **kwargs):
-        db = Database(config["db"])
+        db = Database(config["db"], **config.get("db_pool", {}))
 
         ca = cls(
             **config,
@@ -1322,8 +1403,13 @@ class AcmeCA(AcmeServerBase):
         async with self._session(request) as session:
             order = await self._db.get_order(session, account_id, order_id)
 
-            cert = acmetk.util.generate_cert_from_csr(
-                order.csr, self._cert, self._private_key
+            # signing is CPU-bound, run it in the default executor to keep the event loop responsive
+            cert = await asyncio.get_running_loop().run_in_executor(
+                None,
+                acmetk.util.generate_cert_from_csr,
+                order.csr,
+                self._cert,
+                self._private_key,
             )
             order.certificate = models.Certificate(
                 status=models.CertificateStatus.VALID, cert=cert
@@ -1349,7 +1435,7 @@ class AcmeCA(AcmeServerBase):
             return self._response(
                 request,
                 body=certificate.cert.public_bytes(serialization.Encoding.PEM)
-                + self._cert.public_bytes(serialization.Encoding.PEM),
+                + self._cert_pem,
                 links=None,
                 content_type="application/pem-certificate-chain",
             )
@@ -1380,7 +1466,7 @@ class AcmeRelayBase(AcmeServerBase):
         :param client: The internal started :class:`AcmeClient` instance
         :return: The server instance
         """
-        db = Database(config["db"])
+        db = Database(config["db"], **config.get("db_pool", {}))
 
         config.pop("client")
 
@@ -1525,8 +1611,9 @@ class AcmeBroker(AcmeRelayBase):
             order = await self._db.get_order(session, account_id, order_id)
 
             try:
+                # finalize_order has already checked that the CSR requests exactly the order's identifiers
                 order_ca = await self._client.order_create(
-                    list(acmetk.util.names_of(order.csr))
+                    [identifier.value for identifier in order.identifiers]
                 )
                 await self._client.authorizations_complete(order_ca)
                 finalized = await self._client.order_finalize(order_ca, order.csr)
@@ -1690,7 +1777,7 @@ class AcmeProxy(AcmeRelayBase):
 
         if order_processing:
             asyncio.ensure_future(
-                self.handle_order_finalize(request, account_id, order_id)
+                self._handle_order_finalize(request, account_id, order_id)
             )
 
         return self._response(
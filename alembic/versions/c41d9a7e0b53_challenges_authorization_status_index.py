@@ -0,0 +1,33 @@
+"""challenges authorization status index
+
+Revision ID: c41d9a7e0b53
+Revises: 24004ca7a5ea
+Create Date: 2026-10-15 10:03:17.531902
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import acmetk.models.account
+import acmetk.models.base
+import acmetk.models.order
+import acmetk.models.certificate
+
+
+# revision identifiers, used by Alembic.
+revision = "c41d9a7e0b53"
+down_revision = "24004ca7a5ea"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        "ix_challenges_authorization_id_status",
+        "challenges",
+        ["authorization_id", "status"],
+        unique=False,
+    )
+
+
+def downgrade():
+    op.drop_index("ix_challenges_authorization_id_status", table_name="challenges")
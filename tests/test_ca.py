@@ -37,6 +37,12 @@ class TestAcme:
     ACCOUNT_KEY_ALG_BITS = ("RSA", 2048)
     CERT_KEY_ALG_BITS = ("RSA", 2048)
 
+    @classmethod
+    def setUpClass(cls) -> None:
+        super().setUpClass()
+        # the certificate key is shared by the tests of a class, generating RSA keys is slow
+        cls._cert_key = None
+
     @property
     def name(self):
         return type(self).__name__[4:]
@@ -51,6 +57,12 @@ class TestAcme:
         elif alg_and_bits[0] == "EC":
             return acmetk.util.generate_ec_key(path, alg_and_bits[1])
 
+    def _make_cert_key(self, path):
+        if self._cert_key is None:
+            type(self)._cert_key = self._make_key(path, self.CERT_KEY_ALG_BITS)
+
+        return self._cert_key
+
     @property
     def names(self):
         return self.config_sec["names"]
@@ -72,7 +84,7 @@ class TestAcme:
         csr_path = dir_ / "client.csr"
 
         self._make_key(client_account_key_path, self.ACCOUNT_KEY_ALG_BITS)
-        client_cert_key = self._make_key(client_cert_key_path, self.CERT_KEY_ALG_BITS)
+        client_cert_key = self._make_cert_key(client_cert_key_path)
 
         csr = acmetk.util.generate_csr(
             self.names[0],
@@ -660,7 +672,19 @@ class TestOurClientStress(TestOurClient):
         await asyncio.gather(*[client.close() for client, _ in clients_csr])
 
     async def test_revoke(self):
-        full_chain = await self._run_one(self.client, self.client_data.csr)
+        # revoking for key compromise gets the key blocked, so do not use the key shared by the class
+        cert_key = self._make_key(
+            self.path / "client_revoke_cert.key", self.CERT_KEY_ALG_BITS
+        )
+        csr = acmetk.util.generate_csr(
+            self.names[0],
+            cert_key,
+            self.path / "client_revoke.csr",
+            names=self.names,
+        )
+        self._rmtree.append("client_revoke.csr")
+
+        full_chain = await self._run_one(self.client, csr)
         certs = acmetk.util.pem_split(full_chain)
         await self.client.certificate_revoke(
             certs[0], reason=RevocationReason.keyCompromise
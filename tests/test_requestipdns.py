@@ -1,6 +1,7 @@
-import ipaddress
 import logging.config
+import types
 import unittest
+import unittest.mock
 
 from acmetk.server import RequestIPDNSChallengeValidator
 
@@ -15,9 +16,100 @@ class TestRequestIPDNSValidator(unittest.IsolatedAsyncioTestCase):
         records_main = await self.requestipdns_validator.query_records(
             "acmenoah.luis.uni-hannover.de"
         )
-        self.assertIn(ipaddress.IPv4Address("130.75.188.105"), records_main)
+        self.assertIn("130.75.188.105", records_main)
 
         records_sub = await self.requestipdns_validator.query_records(
             "sub.acmenoah.luis.uni-hannover.de"
         )
-        self.assertIn(ipaddress.IPv4Address("130.75.188.105"), records_sub)
+        self.assertIn("130.75.188.105", records_sub)
+
+
+class RRset(list):
+    def __init__(self, addresses, ttl):
+        super().__init__(
+            types.SimpleNamespace(address=address) for address in addresses
+        )
+        self.ttl = ttl
+
+
+class TestRequestIPDNSValidatorCache(unittest.IsolatedAsyncioTestCase):
+    TTL = 300
+
+    async def asyncSetUp(self) -> None:
+        self.requestipdns_validator = RequestIPDNSChallengeValidator()
+
+        # the smallest TTL of the answer's chain, lower than the record's TTL if a CNAME expires sooner
+        self.chain_ttl = self.TTL
+        self.resolve = unittest.mock.AsyncMock(
+            side_effect=lambda name, type_: types.SimpleNamespace(
+                rrset=RRset(["192.0.2.1"], self.TTL),
+                expiration=self.time.return_value + self.chain_ttl,
+            )
+        )
+        self.requestipdns_validator._resolver.resolve = self.resolve
+
+        # only the validator's clocks are replaced, the event loop keeps using the real ones
+        patcher = unittest.mock.patch("acmetk.server.challenge_validator.time")
+        time_ = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.monotonic = time_.monotonic
+        self.monotonic.return_value = 1000.0
+        self.time = time_.time
+        self.time.return_value = 1700000000.0
+
+    def advance(self, seconds):
+        self.monotonic.return_value += seconds
+        self.time.return_value += seconds
+
+    async def test_cache_hit(self):
+        for _ in range(2):
+            records = await self.requestipdns_validator.query_records("example.com")
+            self.assertEqual({"192.0.2.1"}, records)
+
+        # one query each for the A and the AAAA record
+        self.assertEqual(2, self.resolve.await_count)
+
+    async def test_cache_expiry(self):
+        await self.requestipdns_validator.query_records("example.com")
+
+        self.advance(self.TTL - 1)
+        await self.requestipdns_validator.query_records("example.com")
+        self.assertEqual(2, self.resolve.await_count)
+
+        self.advance(1)
+        await self.requestipdns_validator.query_records("example.com")
+        self.assertEqual(4, self.resolve.await_count)
+
+    async def test_cache_expiry_cname(self):
+        self.chain_ttl = 60
+        await self.requestipdns_validator.query_records("example.com")
+
+        self.advance(self.chain_ttl)
+        await self.requestipdns_validator.query_records("example.com")
+        self.assertEqual(4, self.resolve.await_count)
+
+    async def test_no_cache(self):
+        for _ in range(2):
+            await self.requestipdns_validator.query_records(
+                "probe.example.com", cache=False
+            )
+
+        self.assertEqual(4, self.resolve.await_count)
+        self.assertFalse(self.requestipdns_validator._cache)
+
+    async def test_cache_eviction(self):
+        self.requestipdns_validator.CACHE_SIZE = 2
+
+        await self.requestipdns_validator._query_record("a.example.com", "A")
+        await self.requestipdns_validator._query_record("b.example.com", "A")
+        # a cache hit makes the record the most recently used one
+        await self.requestipdns_validator._query_record("a.example.com", "A")
+        await self.requestipdns_validator._query_record("c.example.com", "A")
+
+        self.assertEqual(
+            [("a.example.com", "A"), ("c.example.com", "A")],
+            list(self.requestipdns_validator._cache),
+        )
+
+        await self.requestipdns_validator._query_record("b.example.com", "A")
+        self.assertEqual(4, self.resolve.await_count)